@@ -1,18 +1,63 @@
 import asyncio
-import json
+import hashlib
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.html
+import orjson
+from cssselect import GenericTranslator
+from lxml import etree
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from .utils_time import to_iso8601
+from .utils_time import now_utc_iso, parse_iso8601
 
 log = logging.getLogger("twitter_parser")
 
+_STATUS_RE = re.compile(r"/status/(\d+)")
+_COUNT_RE = re.compile(r"(\d[\d,.]*)\s+(\w+)")
+_WS_RE = re.compile(r"\s+")
+
+# Stat label (lowercased, singular or plural) -> output field
+_KIND_MAP = {
+    "likes": "favorites",
+    "like": "favorites",
+    "retweets": "retweets",
+    "retweet": "retweets",
+    "replies": "replies",
+    "reply": "replies",
+    "quotes": "quotes",
+    "quote": "quotes",
+}
+
+_TRANSLATOR = GenericTranslator()
+
+def _css(selector: str) -> etree.XPath:
+    """Translate a CSS selector to a compiled XPath evaluator."""
+    return etree.XPath(_TRANSLATOR.css_to_xpath(selector))
+
+_SEL_TIMELINE = _css("div.timeline > div.timeline-item")
+_SEL_TWEET_LINK = _css("a.tweet-link")
+_SEL_CONTENT = _css(".tweet-content")
+_SEL_DATE = _css("span.tweet-date > a")
+_SEL_STATS = _css("div.tweet-stats > span")
+_SEL_IMAGES = _css(".attachments .attachment.image img")
+_SEL_VIDEOS = _css(".attachments .attachment.video")
+_SEL_AVATAR = _css("a.profile-card-avatar img")
+_SEL_FULLNAME = _css("a.profile-card-fullname")
+_SEL_VERIFIED = _css("span.profile-bio .icon-verified, .profile-card .icon-verified")
+
+def _first(selector: etree.XPath, node: Any) -> Any:
+    found = selector(node)
+    return found[0] if found else None
+
+def _text(node: Any) -> str:
+    # Join text nodes with a space so words split by <br>/block elements stay
+    # apart (text_content() would glue them); one regex pass normalizes spacing
+    return _WS_RE.sub(" ", " ".join(node.itertext())).strip()
+
 @dataclass
 class TimelineFetcher:
     """
@@ -23,19 +68,35 @@ class TimelineFetcher:
     timeout_seconds: float = 20.0
     proxy: Optional[str] = None
     max_posts: int = 50
+    # Wall-clock budget for the network strategies per user (None = unbounded);
+    # on expiry the synthetic fallback still runs
+    deadline_seconds: Optional[float] = None
+
+    _client: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False)
+    _base: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._base = self.nitter_base.rstrip("/")
 
-    def _client(self) -> httpx.AsyncClient:
-        proxies = None
-        if self.proxy:
-            proxies = {"all://": self.proxy}
-        return httpx.AsyncClient(
+    async def __aenter__(self) -> "TimelineFetcher":
+        # One pooled client for the whole run so every username (and both
+        # strategies) reuse keep-alive connections / HTTP/2 streams.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
             timeout=self.timeout_seconds,
             headers={
                 "User-Agent": "Mozilla/5.0 (compatible; TimelineFetcher/1.0; +https://bitbash.dev)"
             },
-            proxies=proxies,
+            proxy=self.proxy,
             follow_redirects=True,
         )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @retry(
         reraise=True,
@@ -43,8 +104,8 @@ class TimelineFetcher:
         wait=wait_exponential(multiplier=0.8, min=1, max=6),
         retry=retry_if_exception_type(httpx.HTTPError),
     )
-    async def _get_html(self, client: httpx.AsyncClient, url: str) -> str:
-        res = await client.get(url)
+    async def _get_html(self, url: str) -> str:
+        res = await self._client.get(url)
         res.raise_for_status()
         return res.text
 
@@ -55,26 +116,35 @@ class TimelineFetcher:
         2) Nitter RSS-json endpoint (_format=json) if supported
         3) Synthetic fallback (no network)
         """
+        if self._client is None:
+            raise RuntimeError("TimelineFetcher must be used as 'async with fetcher:'")
         screen_name = screen_name.lstrip("@").strip()
         try:
-            async with self._client() as client:
+            async with asyncio.timeout(self.deadline_seconds):
                 # Strategy 1: HTML scrape
-                url = f"{self.nitter_base.rstrip('/')}/{screen_name}"
-                html = await self._get_html(client, url)
-                items = self._parse_nitter_html(html, screen_name)
+                url = f"{self._base}/{screen_name}"
+                html = await self._get_html(url)
+                # Parsing is pure CPU (lxml releases the GIL); keep the loop free
+                items = await asyncio.to_thread(self._parse_nitter_html, html, screen_name)
                 if items:
                     return items[: self.max_posts]
 
                 # Strategy 2: _format=json (not every instance supports this)
-                json_url = f"{self.nitter_base.rstrip('/')}/{screen_name}?_format=json"
+                json_url = f"{self._base}/{screen_name}?_format=json"
                 try:
-                    txt = await self._get_html(client, json_url)
-                    data = json.loads(txt)
+                    txt = await self._get_html(json_url)
+                    data = orjson.loads(txt)
                     candidate = self._parse_nitter_json(data, screen_name)
                     if candidate:
                         return candidate[: self.max_posts]
                 except Exception as e:
                     log.debug("JSON strategy failed for @%s: %s", screen_name, e)
+        except TimeoutError:
+            log.warning(
+                "Network strategies for @%s exceeded %.1fs deadline",
+                screen_name,
+                self.deadline_seconds,
+            )
         except Exception as e:
             log.warning("Network strategies failed for @%s: %s", screen_name, e)
 
@@ -85,26 +155,37 @@ class TimelineFetcher:
     # --------- Parsers ---------
 
     def _parse_nitter_html(self, html: str, screen_name: str) -> List[Dict[str, Any]]:
-        soup = BeautifulSoup(html, "html.parser")
-        timeline = soup.select("div.timeline > div.timeline-item")
+        # Unparseable pages (empty/comment-only, or an XML encoding
+        # declaration on a str) yield no items so the JSON strategy still runs
+        try:
+            tree = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError):
+            return []
+        timeline = _SEL_TIMELINE(tree)
         results: List[Dict[str, Any]] = []
+        # Profile card is page-level: resolve once, share across items
+        author = self._parse_nitter_author(tree, screen_name)
         for item in timeline:
             # Tweet id from links like /user/status/12345
             sid = None
-            link = item.select_one("a.tweet-link")
-            if link and link.get("href"):
-                m = re.search(r"/status/(\d+)", link.get("href"))
+            link = _first(_SEL_TWEET_LINK, item)
+            href = link.get("href") if link is not None else None
+            if href:
+                m = _STATUS_RE.search(href)
                 if m:
                     sid = m.group(1)
 
             # Content
-            content = item.select_one(".tweet-content")
-            text = content.get_text(" ", strip=True) if content else None
+            content = _first(_SEL_CONTENT, item)
+            text = _text(content) if content is not None else None
 
             # Date
-            date_node = item.select_one("span.tweet-date > a")
-            created_at = date_node.get("title") if date_node else None
-            created_at_iso = to_iso8601(created_at) if created_at else None
+            date_node = _first(_SEL_DATE, item)
+            created_at = date_node.get("title") if date_node is not None else None
+            # Nitter titles look like "Jan 26, 2024 · 3:44 PM UTC"; dateutil
+            # rejects the middle dot, so drop it before normalizing.
+            # Unparseable dates become None rather than the scrape time.
+            created_at_iso = parse_iso8601(created_at.replace("·", " ")) if created_at else None
 
             # Counts (may be present in aria-label or in count nodes)
             stats = {
@@ -115,52 +196,33 @@ class TimelineFetcher:
                 "bookmarks": None,
                 "views": None,
             }
-            for s in item.select("div.tweet-stats > span"):
-                label = s.get("title") or s.get_text("", strip=True)
+            for s in _SEL_STATS(item):
+                label = s.get("title") or _text(s)
                 if not label:
                     continue
                 # e.g., "12 Likes", "3 Retweets", "4 Replies"
-                m_count = re.search(r"(\d[\d,\.]*)\s+(\w+)", label)
+                m_count = _COUNT_RE.search(label)
                 if not m_count:
                     continue
                 val = int(m_count.group(1).replace(",", "").replace(".", ""))
-                kind = m_count.group(2).lower()
-                if "like" in kind:
-                    stats["favorites"] = val
-                elif "retweet" in kind:
-                    stats["retweets"] = val
-                elif "repl" in kind:
-                    stats["replies"] = val
-                elif "quote" in kind:
-                    stats["quotes"] = val
+                key = _KIND_MAP.get(m_count.group(2).lower())
+                if key is not None:
+                    stats[key] = val
 
             # Media (basic)
             media = []
-            for img in item.select(".attachments .attachment.image img"):
-                if img.get("src"):
-                    media.append({"type": "photo", "url": img.get("src")})
-            for video in item.select(".attachments .attachment.video"):
+            for img in _SEL_IMAGES(item):
+                src = img.get("src")
+                if src:
+                    media.append({"type": "photo", "url": src})
+            for video in _SEL_VIDEOS(item):
                 poster = video.get("data-poster")
                 if poster:
                     media.append({"type": "video", "url": poster})
 
-            # Author
-            avatar = soup.select_one("a.profile-card-avatar img")
-            display = soup.select_one("a.profile-card-fullname")
-            verified = bool(soup.select_one("span.profile-bio .icon-verified")) or bool(
-                soup.select_one(".profile-card .icon-verified")
-            )
-            author = {
-                "rest_id": None,
-                "name": display.get_text(strip=True) if display else screen_name,
-                "screen_name": screen_name,
-                "avatar": avatar.get("src") if avatar and avatar.get("src") else None,
-                "blue_verified": verified,
-            }
-
             obj = {
                 "tweet_id": sid,
-                "created_at": created_at or created_at_iso,
+                "created_at": created_at_iso,
                 "text": text,
                 "lang": None,
                 "views": stats["views"],
@@ -179,6 +241,19 @@ class TimelineFetcher:
                 break
         return results
 
+    def _parse_nitter_author(
+        self, tree: lxml.html.HtmlElement, screen_name: str
+    ) -> Dict[str, Any]:
+        avatar = _first(_SEL_AVATAR, tree)
+        display = _first(_SEL_FULLNAME, tree)
+        return {
+            "rest_id": None,
+            "name": _text(display) if display is not None else screen_name,
+            "screen_name": screen_name,
+            "avatar": (avatar.get("src") or None) if avatar is not None else None,
+            "blue_verified": bool(_SEL_VERIFIED(tree)),
+        }
+
     def _parse_nitter_json(self, data: Any, screen_name: str) -> List[Dict[str, Any]]:
         # Some instances return a JSON array of tweets with minimal fields
         results: List[Dict[str, Any]] = []
@@ -192,9 +267,10 @@ class TimelineFetcher:
         for tw in items:
             tid = str(tw.get("id")) if tw.get("id") is not None else None
             created_at = tw.get("date") or tw.get("created_at")
+            created_at_iso = parse_iso8601(created_at)
             obj = {
                 "tweet_id": tid,
-                "created_at": created_at or to_iso8601(created_at) if created_at else None,
+                "created_at": created_at_iso,
                 "text": tw.get("text"),
                 "lang": tw.get("lang"),
                 "views": tw.get("views"),
@@ -220,13 +296,21 @@ class TimelineFetcher:
 
     def _synthetic_posts(self, screen_name: str) -> List[Dict[str, Any]]:
         # Deterministic pseudo data for offline/blocked network scenarios
-        base_id = abs(hash(screen_name)) % 10_000_000_000
-        out: List[Dict[str, Any]] = []
-        for i in range(min(self.max_posts, 10)):
-            tid = str(base_id + i)
-            obj = {
-                "tweet_id": tid,
-                "created_at": to_iso8601(None),
+        # (blake2b rather than hash(), which is salted per process)
+        digest = hashlib.blake2b(screen_name.encode("utf-8"), digest_size=5).digest()
+        base_id = int.from_bytes(digest, "big") % 10_000_000_000
+        created_at = now_utc_iso()
+        author = {
+            "rest_id": None,
+            "name": screen_name,
+            "screen_name": screen_name,
+            "avatar": None,
+            "blue_verified": False,
+        }
+        return [
+            {
+                "tweet_id": (tid := str(base_id + i)),
+                "created_at": created_at,
                 "text": f"SYNTHETIC: Hello from @{screen_name} #{i}",
                 "lang": "en",
                 "views": str(1000 + i * 7),
@@ -237,13 +321,7 @@ class TimelineFetcher:
                 "bookmarks": None,
                 "conversation_id": tid,
                 "media": [],
-                "author": {
-                    "rest_id": None,
-                    "name": screen_name,
-                    "screen_name": screen_name,
-                    "avatar": None,
-                    "blue_verified": False,
-                },
+                "author": author,
             }
-            out.append(obj)
-        return out
\ No newline at end of file
+            for i in range(min(self.max_posts, 10))
+        ]
\ No newline at end of file
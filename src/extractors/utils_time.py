@@ -1,4 +1,6 @@
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
 from dateutil import parser
 
 def to_iso8601(dt_str: str | None) -> str:
@@ -6,15 +8,31 @@ def to_iso8601(dt_str: str | None) -> str:
     Convert various Twitter-like date strings to ISO 8601.
     If dt_str is None or parsing fails, return current UTC ISO string.
     """
-    if dt_str:
-        try:
-            dt = parser.parse(dt_str)
-            if not dt.tzinfo:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc).isoformat()
-        except Exception:
-            pass
-    return now_utc_iso()
+    iso = parse_iso8601(dt_str)
+    return iso if iso is not None else now_utc_iso()
+
+def parse_iso8601(dt_str: Any) -> str | None:
+    """
+    Like to_iso8601, but return None instead of "now" when dt_str is
+    missing or unparseable. Use this for source timestamps.
+    """
+    # Non-str input (e.g. a list from the JSON endpoint) is unparseable and
+    # would be unhashable for the cache
+    if dt_str and isinstance(dt_str, str):
+        return _parse_iso(dt_str)
+    return None
+
+@lru_cache(maxsize=4096)
+def _parse_iso(dt_str: str) -> str | None:
+    # Cached: timelines repeat the same minute-granularity strings often.
+    # Returns None (not "now") on failure so no wall-clock value is cached.
+    try:
+        dt = parser.parse(dt_str)
+    except Exception:
+        return None
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
 
 def now_utc_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
\ No newline at end of file
+    return datetime.now(timezone.utc).isoformat()
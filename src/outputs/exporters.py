@@ -1,10 +1,14 @@
-import json
 import logging
 from pathlib import Path
 from typing import Iterable, List, Dict, Any
 
+import orjson
+
 log = logging.getLogger("exporters")
 
+# NDJSON records are joined and flushed to the file in batches of this size
+_NDJSON_BATCH = 1024
+
 class Exporter:
     """
     Writes timeline items to JSON (array) or NDJSON.
@@ -22,11 +26,19 @@ class Exporter:
             self._write_json(items)
 
     def _write_json(self, items: List[Dict[str, Any]]) -> None:
-        self.output_path.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.output_path.write_bytes(
+            orjson.dumps(items, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
         log.info("JSON written to %s", self.output_path)
 
     def _write_ndjson(self, items: Iterable[Dict[str, Any]]) -> None:
-        with self.output_path.open("w", encoding="utf-8") as f:
+        buf: List[bytes] = []
+        with self.output_path.open("wb", buffering=1 << 20) as f:
             for obj in items:
-                f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                buf.append(orjson.dumps(obj))
+                if len(buf) >= _NDJSON_BATCH:
+                    f.write(b"\n".join(buf) + b"\n")
+                    buf.clear()
+            if buf:
+                f.write(b"\n".join(buf) + b"\n")
         log.info("NDJSON written to %s", self.output_path)
\ No newline at end of file
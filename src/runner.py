@@ -3,9 +3,15 @@ import json
 import logging
 import os
 import sys
+from itertools import chain
 from pathlib import Path
 from typing import List, Optional
 
+try:
+    import uvloop
+except ImportError:  # optional; unavailable on Windows
+    uvloop = None
+
 from extractors.twitter_parser import TimelineFetcher
 from outputs.exporters import Exporter
 from extractors.utils_time import now_utc_iso
@@ -30,17 +36,21 @@ def setup_logging(verbosity: int = 1) -> None:
         datefmt="%Y-%m-%dT%H:%M:%SZ",
     )
 
+# (setting key, environment variable, converter, default)
+_ENV_SPEC = (
+    ("max_posts_per_user", "MAX_POSTS_PER_USER", int, "50"),
+    ("concurrency", "CONCURRENCY", int, "5"),
+    ("output_path", "OUTPUT_PATH", str, str(DEFAULT_OUTPUT)),
+    ("ndjson", "NDJSON", lambda v: v.lower() == "true", "false"),
+    ("timeout_seconds", "HTTP_TIMEOUT", float, "20"),
+    ("nitter_base", "NITTER_BASE", str, "https://nitter.net"),
+)
+
 def load_settings(settings_path: Optional[Path]) -> dict:
     # Environment first
-    cfg = {
-        "max_posts_per_user": int(os.getenv("MAX_POSTS_PER_USER", "50")),
-        "concurrency": int(os.getenv("CONCURRENCY", "5")),
-        "output_path": os.getenv("OUTPUT_PATH", str(DEFAULT_OUTPUT)),
-        "ndjson": os.getenv("NDJSON", "false").lower() == "true",
-        "timeout_seconds": float(os.getenv("HTTP_TIMEOUT", "20")),
-        "proxy": os.getenv("HTTP_PROXY") or os.getenv("http_proxy"),
-        "nitter_base": os.getenv("NITTER_BASE", "https://nitter.net"),
-    }
+    cfg = {key: conv(os.getenv(env, default)) for key, env, conv, default in _ENV_SPEC}
+    # Empty HTTP_PROXY means "unset", so fall through to the lowercase form
+    cfg["proxy"] = os.environ.get("HTTP_PROXY") or os.environ.get("http_proxy") or None
     # Override with file if exists
     if settings_path and settings_path.exists():
         try:
@@ -67,12 +77,8 @@ def load_usernames(args: List[str]) -> List[str]:
             "No CLI usernames provided and %s missing. Using sample accounts.", path
         )
         return ["jack", "Twitter", "elonmusk"]
-    names = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        names.append(line)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    names = [s for s in map(str.strip, lines) if s and not s.startswith("#")]
     if not names:
         names = ["jack"]
     return list(dict.fromkeys(names))
@@ -83,23 +89,32 @@ async def fetch_all(usernames: List[str], cfg: dict) -> List[dict]:
         timeout_seconds=cfg["timeout_seconds"],
         proxy=cfg.get("proxy"),
         max_posts=cfg["max_posts_per_user"],
+        # Per-user network budget; stragglers are cancelled (and fall back to
+        # synthetic data) so they release their semaphore slot promptly
+        deadline_seconds=cfg["timeout_seconds"] * 2,
     )
     sem = asyncio.Semaphore(cfg["concurrency"])
-    results: List[dict] = []
 
-    async def _task(name: str):
+    async def _task(name: str) -> List[dict]:
         async with sem:
+            # Errors stay inside the task so one user never cancels the group
             try:
                 items = await fetcher.fetch_username(name)
-                results.extend(items)
                 logging.info("Fetched %d posts for @%s", len(items), name)
+                return items
             except Exception as e:
                 logging.exception("Failed fetching @%s: %s", name, e)
+                return []
 
-    await asyncio.gather(*[_task(u) for u in usernames])
-    # Attach run metadata
+    async with fetcher:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_task(u)) for u in usernames]
+    # Flatten once, in input order, so output is deterministic
+    results: List[dict] = list(chain.from_iterable(t.result() for t in tasks))
+    # Attach run metadata (one timestamp per run, not per record)
+    fetched_at = now_utc_iso()
     for obj in results:
-        obj.setdefault("_fetched_at", now_utc_iso())
+        obj.setdefault("_fetched_at", fetched_at)
         obj.setdefault("_source", "nitter")
     return results
 
@@ -109,7 +124,10 @@ def main():
     usernames = load_usernames(sys.argv[1:])
     logging.info("Targets: %s", ", ".join(usernames))
 
-    items = asyncio.run(fetch_all(usernames, cfg))
+    # libuv-backed loop when available, stdlib loop otherwise
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as loop_runner:
+        items = loop_runner.run(fetch_all(usernames, cfg))
     Exporter(
         output_path=Path(cfg["output_path"]),
         ndjson=cfg["ndjson"],